@@ -0,0 +1,87 @@
+from array import array
+
+# Six-dot braille lives in U+2800..U+283F; the low six bits of the codepoint are the dots
+BRAILLE_BASE = 0x2800
+DOT_MASK = 0x3F
+
+# Cell value marking a character the converter passed through without a braille mapping
+UNMAPPED = 0xFF
+
+# Cache of braille strings (e.g. '⠰⠝') to their encoded cell bytes
+_encoded = {}
+
+# str.translate table turning cell bytes (decoded as latin-1) back into braille characters
+_to_unicode = {value: chr(BRAILLE_BASE + value) for value in range(DOT_MASK + 1)}
+
+
+def encode_cells(braille):
+    """Encode a string of six-dot braille characters as one byte per cell"""
+    encoded = _encoded.get(braille)
+    if encoded is None:
+        values = [ord(char) - BRAILLE_BASE for char in braille]
+        if any(value < 0 or value > DOT_MASK for value in values):
+            raise ValueError(f"Not a six-dot braille string: {braille!r}")
+        encoded = _encoded[braille] = bytes(values)
+    return encoded
+
+
+class BrailleCells:
+    """Braille output as a compact buffer of six-dot patterns, one byte per cell.
+
+    Bit n of a cell is dot n+1, matching the Unicode braille block. Characters
+    the converter has no mapping for are stored as UNMAPPED cells and kept in
+    `unmapped` so `to_unicode()` reproduces the string output exactly. When
+    offsets are tracked, `offsets[k]` is the index in the source text of the
+    character that produced cell k.
+    """
+
+    def __init__(self, track_offsets=False):
+        # bytearray already over-allocates as it grows; writing into a presized
+        # buffer through slice assignment is several times slower in CPython
+        self.cells = bytearray()
+        self.offsets = array('I') if track_offsets else None
+        self.unmapped = []
+
+    def append(self, braille, source):
+        """Append the cells of a braille string produced from text[source]"""
+        encoded = _encoded.get(braille) or encode_cells(braille)
+        self.cells += encoded
+        if self.offsets is not None:
+            self.offsets.extend([source] * len(encoded))
+
+    def append_unmapped(self, char, source):
+        """Append a character that has no braille mapping"""
+        self.cells.append(UNMAPPED)
+        self.unmapped.append(char)
+        if self.offsets is not None:
+            self.offsets.append(source)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __bytes__(self):
+        return bytes(self.cells)
+
+    def view(self):
+        """Zero-copy, read-only view of the cell buffer (it cannot grow while views exist)"""
+        return memoryview(self.cells).toreadonly()
+
+    def as_numpy(self):
+        """Zero-copy, read-only NumPy uint8 view of the cell buffer"""
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("as_numpy() requires numpy: pip install numpy") from None
+        return np.frombuffer(self.view(), dtype=np.uint8)
+
+    def to_unicode(self):
+        """Render the cells as the Unicode braille string the converters return"""
+        text = self.cells.decode('latin-1').translate(_to_unicode)
+        if not self.unmapped:
+            return text
+        pieces = text.split(chr(UNMAPPED))
+        result = [pieces[0]]
+        for char, piece in zip(self.unmapped, pieces[1:]):
+            result.append(char)
+            result.append(piece)
+        return ''.join(result)
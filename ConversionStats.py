@@ -0,0 +1,92 @@
+from collections import Counter
+from time import perf_counter
+
+
+class ConversionStats:
+    """Counters and phase timings collected by Grade2BrailleConverter when passed `stats=`.
+
+    One instance covers one document; passing the same instance to several
+    conversions accumulates their totals.
+    """
+
+    def __init__(self):
+        self.documents = 0
+        self.characters = 0
+        self.cells = 0
+        self.scans = Counter()
+        self.misses = Counter()
+        self.probes = {'whole_word': Counter(), 'letter_group': Counter()}
+        self.matches = {'whole_word': Counter(), 'letter_group': Counter()}
+        self.positions = {'whole_word': {}, 'letter_group': {}}
+        self.times = {'whole_word': 0.0, 'letter_group': 0.0, 'total': 0.0}
+        self.events = Counter()
+        self.unmapped = Counter()
+
+    def start_document(self, text):
+        self.documents += 1
+        self.characters += len(text)
+        return perf_counter()
+
+    def end_document(self, cells, started):
+        self.cells += cells
+        self.times['total'] += perf_counter() - started
+
+    def record_scan(self, phase, rules, matched, started):
+        """Record one pass over a contraction table that stopped at `matched` (or ran out)"""
+        self.times[phase] += perf_counter() - started
+        self.scans[phase] += 1
+        if matched is None:
+            self.misses[phase] += 1
+        probes = self.probes[phase]
+        for position, rule in enumerate(rules, 1):
+            probes[rule] += 1
+            if rule == matched:
+                self.matches[phase][rule] += 1
+                self.positions[phase][rule] = position
+                break
+
+    def count(self, event):
+        self.events[event] += 1
+
+    def count_unmapped(self, char):
+        self.events['unmapped'] += 1
+        self.unmapped[char] += 1
+
+    def report(self, top=5):
+        """Human-readable summary of where the conversion spent its probes and time.
+
+        Scans always probe rules in table order, so a rule's probe count mostly
+        reflects its position in the table. Rules are therefore ranked by
+        matches and shown with that position; the input shows up in the miss
+        counts and probes per scan.
+        """
+        other = self.times['total'] - self.times['whole_word'] - self.times['letter_group']
+        lines = [
+            f"Grade 2 conversion: {self.documents} document(s), {self.characters} characters "
+            f"-> {self.cells} cells in {self.times['total'] * 1000:.2f} ms",
+        ]
+        for phase, label in (('whole_word', 'Whole-word scan'), ('letter_group', 'Letter-group scan')):
+            probes = self.probes[phase]
+            matches = self.matches[phase]
+            scans = self.scans[phase]
+            total_probes = sum(probes.values())
+            lines.append(
+                f"  {label}: {scans} scans ({self.misses[phase]} without a match), "
+                f"{total_probes} probes ({total_probes / scans if scans else 0:.1f} per scan), "
+                f"{sum(matches.values())} matches, {self.times[phase] * 1000:.2f} ms"
+            )
+            for rule, matched in matches.most_common(top):
+                lines.append(
+                    f"    {rule!r}: {matched} matches, "
+                    f"position {self.positions[phase][rule]} in the table"
+                )
+        lines.append(f"  Everything else: {other * 1000:.2f} ms")
+        lines.append(
+            "  Special characters: {special}, digits: {digit}, number signs: {number_sign}, "
+            "capital signs: {capital}, punctuation: {punctuation}, spaces: {space}, "
+            "single-letter fallbacks: {letter}, unmapped: {unmapped}".format_map(self.events)
+        )
+        if self.unmapped:
+            passed = ', '.join(f"{char!r} x{n}" for char, n in self.unmapped.most_common(top))
+            lines.append(f"  Unmapped characters: {passed}")
+        return '\n'.join(lines)
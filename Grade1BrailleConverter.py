@@ -1,3 +1,5 @@
+from BrailleCells import BrailleCells
+
 class Grade1BrailleConverter:
     def __init__(self):
         # Single characters
@@ -85,49 +87,51 @@ class Grade1BrailleConverter:
     def to_braille(self, text):
         if not text:
             return ""
+        return self.to_braille_cells(text).to_unicode()
+
+    def to_braille_cells(self, text, track_offsets=False):
+        """Convert text to a BrailleCells buffer of one byte per six-dot cell"""
+        result = BrailleCells(track_offsets)
+        if not text:
+            return result
 
-        result = []
-        i = 0
+        append = result.append
         in_number = False
-        
-        while i < len(text):
+
+        for i, char in enumerate(text):
             # Check for special characters first
-            if text[i] in self.special_chars:
-                result.append(self.special_chars[text[i]])
-                i += 1
+            if char in self.special_chars:
+                append(self.special_chars[char], i)
                 in_number = False
                 continue
 
             # Check for numbers
-            if text[i].isdigit():
+            if char.isdigit():
                 if not in_number:
-                    result.append('⠼')  # Number sign
+                    append('⠼', i)  # Number sign
                     in_number = True
-                result.append(self.numbers[text[i]])
-                i += 1
+                append(self.numbers[char], i)
                 continue
             else:
                 in_number = False
 
             # Check for uppercase
-            if text[i].isupper():
-                result.append('⠠')  # Capital sign
+            if char.isupper():
+                append('⠠', i)  # Capital sign
 
             # Check for punctuation
-            if text[i] in self.punctuation:
-                result.append(self.punctuation[text[i]])
-                i += 1
+            if char in self.punctuation:
+                append(self.punctuation[char], i)
                 continue
 
             # Handle regular letters
-            char = text[i].lower()
+            char = char.lower()
             if char in self.alphabet:
-                result.append(self.alphabet[char])
+                append(self.alphabet[char], i)
             else:
-                result.append(char)  # Keep unrecognized characters as-is
-            i += 1
+                result.append_unmapped(char, i)  # Keep unrecognized characters as-is
 
-        return ''.join(result)
+        return result
 
 
 # Example usage
@@ -1,5 +1,9 @@
 import json
 import re
+import sys
+from time import perf_counter
+from BrailleCells import BrailleCells
+from ConversionStats import ConversionStats
 
 class Grade2BrailleConverter:
     def __init__(self):
@@ -120,18 +124,34 @@ class Grade2BrailleConverter:
         
         return before_ok and after_ok
 
-    def to_braille(self, text):
-        if not text:
+    def to_braille(self, text, stats=None):
+        if not text and stats is None:
             return ""
+        return self.to_braille_cells(text, stats=stats).to_unicode()
+
+    def to_braille_cells(self, text, track_offsets=False, stats=None):
+        """Convert text to a BrailleCells buffer of one byte per six-dot cell.
+
+        Pass a ConversionStats as `stats` to count contraction probes, matches,
+        fallbacks and unmapped characters and to time each matching phase.
+        """
+        result = BrailleCells(track_offsets)
+        if stats is not None:
+            document_started = stats.start_document(text or "")
+        if not text:
+            if stats is not None:
+                stats.end_document(0, document_started)
+            return result
 
-        result = []
         i = 0
         in_number = False
         
         while i < len(text):
             # Check for special characters first
             if text[i] in self.special_chars:
-                result.append(self.special_chars[text[i]])
+                result.append(self.special_chars[text[i]], i)
+                if stats is not None:
+                    stats.count('special')
                 i += 1
                 in_number = False
                 continue
@@ -139,9 +159,13 @@ class Grade2BrailleConverter:
             # Check for numbers
             if text[i].isdigit():
                 if not in_number:
-                    result.append('⠼')
+                    result.append('⠼', i)
                     in_number = True
-                result.append(self.numbers[text[i]])
+                    if stats is not None:
+                        stats.count('number_sign')
+                result.append(self.numbers[text[i]], i)
+                if stats is not None:
+                    stats.count('digit')
                 i += 1
                 continue
             else:
@@ -149,50 +173,71 @@ class Grade2BrailleConverter:
 
             # Check for uppercase
             if text[i].isupper():
-                result.append('⠠')
+                result.append('⠠', i)
+                if stats is not None:
+                    stats.count('capital')
 
             # Check for punctuation
             if text[i] in self.punctuation:
-                result.append(self.punctuation[text[i]])
+                result.append(self.punctuation[text[i]], i)
+                if stats is not None:
+                    stats.count('punctuation')
                 i += 1
                 continue
 
             # Check for whole word contractions
+            if stats is not None:
+                scan_started = perf_counter()
             word_found = False
             for word, contraction in self.whole_word_contractions.items():
                 if self._is_whole_word(text, i, word):
                     if i == 0 or text[i-1] == ' ':
-                        result.append(contraction)
+                        result.append(contraction, i)
                         i += len(word)
                         word_found = True
                         break
+            if stats is not None:
+                stats.record_scan('whole_word', self.whole_word_contractions,
+                                  word if word_found else None, scan_started)
             if word_found:
                 continue
 
             # Check for letter group contractions
+            if stats is not None:
+                scan_started = perf_counter()
             group_found = False
             for group, contraction in self.letter_group_contractions.items():
                 if i + len(group) <= len(text) and text[i:i+len(group)].lower() == group:
-                    result.append(contraction)
+                    result.append(contraction, i)
                     i += len(group)
                     group_found = True
                     break
+            if stats is not None:
+                stats.record_scan('letter_group', self.letter_group_contractions,
+                                  group if group_found else None, scan_started)
             if group_found:
                 continue
 
             # Handle regular letters
             char = text[i].lower()
             if char in self.alphabet:
-                result.append(self.alphabet[char])
+                result.append(self.alphabet[char], i)
+                if stats is not None:
+                    stats.count('space' if char == ' ' else 'letter')
             else:
-                result.append(char)  # Keep unrecognized characters as-is
+                result.append_unmapped(char, i)  # Keep unrecognized characters as-is
+                if stats is not None:
+                    stats.count_unmapped(char)
             i += 1
 
-        return ''.join(result)
+        if stats is not None:
+            stats.end_document(len(result), document_started)
+        return result
 
 # Example usage
 if __name__ == "__main__":
     converter = Grade2BrailleConverter()
+    show_stats = "--stats" in sys.argv  # Print a matcher report for each test case
     
     # Test cases including special characters
     test_cases = [
@@ -211,7 +256,10 @@ if __name__ == "__main__":
     print("Grade 2 Braille Conversion Tests:")
     print("-" * 50)
     for test in test_cases:
-        braille = converter.to_braille(test)
+        stats = ConversionStats() if show_stats else None
+        braille = converter.to_braille(test, stats=stats)
         print(f"Original: {test}")
         print(f"Braille:  {braille}")
+        if stats is not None:
+            print(stats.report())
         print("-" * 50)
\ No newline at end of file
@@ -0,0 +1,279 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from groq import AsyncGroq, APIConnectionError, InternalServerError, RateLimitError
+from Grade1BrailleConverter import Grade1BrailleConverter
+from Grade2BrailleConverter import Grade2BrailleConverter
+
+PROMPT_SUFFIX = ". Generate the response in a concise manner."
+
+
+class RateLimiter:
+    """Keep requests and tokens under per-minute budgets, backing off on 429s"""
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.request_allowance = float(requests_per_minute)
+        self.token_allowance = float(tokens_per_minute)
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+        self.backoff = 1.0
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.request_allowance = min(
+            self.requests_per_minute,
+            self.request_allowance + elapsed * self.requests_per_minute / 60
+        )
+        self.token_allowance = min(
+            self.tokens_per_minute,
+            self.token_allowance + elapsed * self.tokens_per_minute / 60
+        )
+
+    async def acquire(self, tokens):
+        """Wait until one request costing `tokens` fits in both budgets"""
+        # A single request larger than the whole budget would otherwise wait forever
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self.lock:
+            while True:
+                self._refill()
+                wait = self.blocked_until - time.monotonic()
+                if wait <= 0:
+                    missing_requests = 1 - self.request_allowance
+                    missing_tokens = tokens - self.token_allowance
+                    wait = max(
+                        missing_requests * 60 / self.requests_per_minute,
+                        missing_tokens * 60 / self.tokens_per_minute,
+                    )
+                if wait <= 0:
+                    self.request_allowance -= 1
+                    self.token_allowance -= tokens
+                    return
+                await asyncio.sleep(wait)
+
+    def settle(self, estimated, actual):
+        """Correct the token budget once the real usage of a request is known"""
+        self.token_allowance -= actual - min(estimated, self.tokens_per_minute)
+
+    def penalize(self, retry_after=None):
+        """Pause every worker after a 429, doubling the pause while they keep coming"""
+        now = time.monotonic()
+        # Requests already in flight when the first 429 arrived belong to the same
+        # episode and must not each double the backoff
+        new_episode = now >= self.blocked_until
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            delay = self.backoff
+            if new_episode:
+                self.backoff = min(self.backoff * 2, 60.0)
+        delay += random.uniform(0, delay / 4)
+        self.blocked_until = max(self.blocked_until, now + delay)
+
+    def relax(self):
+        """Shrink the backoff again after a successful request"""
+        self.backoff = max(self.backoff / 2, 1.0)
+
+
+def estimate_tokens(prompt, max_tokens):
+    """Rough upper bound on the tokens a request will consume (~4 characters per token)"""
+    return len(prompt) // 4 + 1 + max_tokens
+
+
+def retry_after_seconds(error):
+    """Read the Retry-After header of a 429 response, if the server sent one"""
+    try:
+        return float(error.response.headers["retry-after"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def read_prompts(prompt_file):
+    """Read one prompt per non-empty line"""
+    with open(prompt_file, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def load_checkpoint(output_file):
+    """Return {index: prompt} for prompts already completed by a previous run"""
+    done = {}
+    path = Path(output_file)
+    if not path.exists():
+        return done
+    with open(path, "rb+") as f:
+        data = f.read()
+        # A crash mid-write leaves a truncated last line; cut it off so new
+        # records start on a fresh line and that prompt is redone
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            f.truncate(complete)
+    for line in data[:complete].decode("utf-8").splitlines():
+        try:
+            record = json.loads(line)
+            done[record["index"]] = record["prompt"]
+        except (ValueError, KeyError, TypeError):
+            continue
+    return done
+
+
+def write_checkpoint(checkpoint, lock, record):
+    """Append one finished record and force it to disk before moving on"""
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with lock:
+        checkpoint.write(line)
+        checkpoint.flush()
+        os.fsync(checkpoint.fileno())
+
+
+def convert_and_save(converter, checkpoint, lock, index, prompt, text):
+    """Convert one completion to braille and checkpoint it; runs in a worker thread"""
+    write_checkpoint(checkpoint, lock, {
+        "index": index,
+        "prompt": prompt,
+        "generated_text": text,
+        "braille_text": converter.to_braille(text),
+    })
+
+
+async def generate_one(client, limiter, prompt, model, temperature, max_tokens, max_attempts):
+    """Generate text for a single prompt, retrying 429s, 5xx and connection errors"""
+    estimated = estimate_tokens(prompt, max_tokens)
+    delay = 1.0
+    for attempt in range(max_attempts):
+        await limiter.acquire(estimated)
+        try:
+            completion = await client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        except RateLimitError as e:
+            # Rate limits are shared, so every worker pauses
+            limiter.penalize(retry_after_seconds(e))
+            if attempt == max_attempts - 1:
+                raise
+            continue
+        except (APIConnectionError, InternalServerError):
+            # Transient failures only concern this request
+            if attempt == max_attempts - 1:
+                raise
+            await asyncio.sleep(delay + random.uniform(0, delay / 4))
+            delay = min(delay * 2, 60.0)
+            continue
+        limiter.relax()
+        if completion.usage is not None:
+            limiter.settle(estimated, completion.usage.total_tokens)
+        return completion.choices[0].message.content
+
+
+async def worker(queue, client, limiter, converter, checkpoint, lock, args, stats):
+    while True:
+        index, prompt = await queue.get()
+        try:
+            text = await generate_one(
+                client, limiter, prompt + PROMPT_SUFFIX, args.model,
+                args.temperature, args.max_tokens, args.max_attempts
+            )
+            # Conversion and fsync both block; keep them off the event loop
+            await asyncio.to_thread(convert_and_save, converter, checkpoint, lock,
+                                    index, prompt, text)
+            stats["done"] += 1
+        except Exception as e:
+            # Failed prompts are not checkpointed, so the next run picks them up again
+            stats["failed"] += 1
+            print(f"Prompt {index} failed: {e}")
+        finally:
+            queue.task_done()
+
+
+async def run(args):
+    prompts = read_prompts(args.prompt_file)
+    done = load_checkpoint(args.output_file)
+    for index, prompt in done.items():
+        if index >= len(prompts) or prompts[index] != prompt:
+            raise SystemExit(
+                f"{args.output_file} does not match {args.prompt_file} at prompt {index}; "
+                "use a new output file after editing the prompts"
+            )
+    pending = [(i, p) for i, p in enumerate(prompts) if i not in done]
+    print(f"{len(prompts)} prompts, {len(done)} already done, {len(pending)} to go")
+    stats = {"done": 0, "failed": 0}
+    if not pending:
+        return stats
+
+    api_key = os.getenv("GROQ_API_KEY")
+    if api_key is None and args.base_url is None:
+        raise SystemExit("GROQ_API_KEY is not set; export it or pass --base-url for a local server")
+    client = AsyncGroq(
+        api_key=api_key or "unused",
+        base_url=args.base_url,
+        max_retries=0  # Retries happen in generate_one so 429s can pause every worker
+    )
+    limiter = RateLimiter(args.requests_per_minute, args.tokens_per_minute)
+    if args.grade == 1:
+        converter = Grade1BrailleConverter()
+    else:
+        converter = Grade2BrailleConverter()
+
+    queue = asyncio.Queue()
+    for item in pending:
+        queue.put_nowait(item)
+
+    lock = threading.Lock()
+    start_time = time.time()
+    with open(args.output_file, "a", encoding="utf-8") as checkpoint:
+        workers = [
+            asyncio.create_task(worker(queue, client, limiter, converter, checkpoint, lock, args, stats))
+            for _ in range(args.concurrency)
+        ]
+        await queue.join()
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    await client.close()
+
+    print(f"Finished in {time.time() - start_time:.2f} seconds: "
+          f"{stats['done']} done, {stats['failed']} failed")
+    return stats
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate completions for a file of prompts and convert them to braille"
+    )
+    parser.add_argument("prompt_file", help="Text file with one prompt per line")
+    parser.add_argument("output_file", help="JSONL checkpoint/output file; rerun to resume")
+    parser.add_argument("--grade", type=int, choices=[1, 2], default=2)
+    parser.add_argument("--model", default="llama3-8b-8192")
+    parser.add_argument("--temperature", type=float, default=0.7)
+    parser.add_argument("--max-tokens", type=positive_int, default=200)
+    parser.add_argument("--concurrency", type=positive_int, default=8,
+                        help="Number of requests kept in flight")
+    parser.add_argument("--requests-per-minute", type=positive_int, default=30)
+    parser.add_argument("--tokens-per-minute", type=positive_int, default=30000)
+    parser.add_argument("--max-attempts", type=positive_int, default=6,
+                        help="Attempts per prompt before giving up on 429s, 5xx or connection errors")
+    parser.add_argument("--base-url", default=None,
+                        help="API base URL, e.g. fake_server.py at http://127.0.0.1:8000")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
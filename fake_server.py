@@ -0,0 +1,112 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Groq clients call /openai/v1/...; plain OpenAI-compatible clients call /v1/...
+COMPLETION_PATHS = ("/openai/v1/chat/completions", "/v1/chat/completions")
+
+
+class FakeCompletionServer(ThreadingHTTPServer):
+    """HTTP server holding the fault-injection options and a log of answered prompts"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency, rate_limit_every, retry_after, fail_every):
+        super().__init__(address, FakeCompletionHandler)
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.fail_every = fail_every
+        self.counter = 0
+        self.answered = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class FakeCompletionHandler(BaseHTTPRequestHandler):
+    """Answer chat completions by echoing the prompt, failing every Nth request on demand"""
+
+    def do_POST(self):
+        if self.path not in COMPLETION_PATHS:
+            self._reply(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.counter += 1
+            number = server.counter
+
+        if server.rate_limit_every and number % server.rate_limit_every == 0:
+            self._reply(429, {"error": {"message": "Rate limit reached", "type": "tokens"}},
+                        {"Retry-After": str(server.retry_after)})
+            return
+        if server.fail_every and number % server.fail_every == 0:
+            self._reply(500, {"error": {"message": "Internal server error"}})
+            return
+
+        time.sleep(server.latency)
+        prompt = body["messages"][-1]["content"]
+        content = f"Echo: {prompt}"
+        with server.lock:
+            server.answered.append(prompt)
+        self._reply(200, {
+            "id": f"fake-{number}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4 + 1,
+                "completion_tokens": len(content) // 4 + 1,
+                "total_tokens": len(prompt) // 4 + len(content) // 4 + 2,
+            },
+        })
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print(f"[{self.server.counter}] {format % args}")
+
+
+def make_server(port=0, latency=0.05, rate_limit_every=0, retry_after=1, fail_every=0):
+    """Create a fake server on 127.0.0.1; port 0 picks a free port (see `server.url`)"""
+    return FakeCompletionServer(("127.0.0.1", port), latency, rate_limit_every,
+                                retry_after, fail_every)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Local fake OpenAI-compatible server for trying out bulk_generate.py"
+    )
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Seconds to wait before each successful reply")
+    parser.add_argument("--rate-limit-every", type=int, default=0,
+                        help="Answer every Nth request with a 429")
+    parser.add_argument("--retry-after", type=float, default=1,
+                        help="Retry-After seconds sent with each 429")
+    parser.add_argument("--fail-every", type=int, default=0,
+                        help="Answer every Nth request with a 500")
+    args = parser.parse_args()
+
+    server = make_server(args.port, args.latency, args.rate_limit_every,
+                         args.retry_after, args.fail_every)
+    print(f"Fake server listening on {server.url}")
+    server.serve_forever()
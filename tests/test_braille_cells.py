@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from BrailleCells import UNMAPPED, BrailleCells, encode_cells
+from Grade1BrailleConverter import Grade1BrailleConverter
+from Grade2BrailleConverter import Grade2BrailleConverter
+
+CONVERTERS = [Grade1BrailleConverter(), Grade2BrailleConverter()]
+
+SAMPLES = [
+    "",
+    "Hello World!",
+    "Price: $99.99 (50% off!)",
+    "{Python} [Code] <HTML>",
+    "Ünïcödé and the ÿ\xff byte\n",
+    "https://www.example.com",
+    "The knowledge of the nation was everything",
+]
+
+
+def random_texts(count=500):
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCZ 0123456789.,;:!?\"'()-/…@#$%°²₃{}\nÉéÿ\xff" + "thechingtionandfor"
+    rng = random.Random(0)
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("converter", CONVERTERS, ids=["grade1", "grade2"])
+def test_cells_round_trip_to_string_output(converter):
+    for text in SAMPLES + random_texts():
+        cells = converter.to_braille_cells(text, track_offsets=True)
+        assert cells.to_unicode() == converter.to_braille(text)
+        assert len(cells.offsets) == len(cells)
+        assert all(offset < len(text) for offset in cells.offsets)
+        assert list(cells.offsets) == sorted(cells.offsets)
+        assert cells.cells.count(UNMAPPED) == len(cells.unmapped)
+
+
+@pytest.mark.parametrize("converter, expected", [
+    (Grade1BrailleConverter(), '{⠠⠏⠽⠞⠓⠕⠝}⠀⠠é'),
+    (Grade2BrailleConverter(), '{⠠⠏⠽⠹⠕⠝}⠀⠠é'),
+], ids=["grade1", "grade2"])
+def test_unmapped_characters_are_kept(converter, expected):
+    cells = converter.to_braille_cells("{Python} É", track_offsets=True)
+    assert converter.to_braille("{Python} É") == expected
+    assert cells.to_unicode() == expected
+    assert cells.unmapped == ['{', '}', 'é']
+    assert bytes(cells)[0] == UNMAPPED
+    assert cells.offsets[0] == 0 and cells.offsets[-1] == 9
+
+
+def test_cells_are_dot_patterns():
+    cells = Grade1BrailleConverter().to_braille_cells("Ab 1")
+    # Capital sign (dot 6), a (dot 1), b (dots 1-2), blank, number sign (dots 3-4-5-6), 1 (dot 1)
+    assert bytes(cells) == bytes([0b100000, 0b1, 0b11, 0, 0b111100, 0b1])
+
+
+def test_view_is_zero_copy_and_read_only():
+    cells = Grade2BrailleConverter().to_braille_cells("the cat")
+    view = cells.view()
+    assert view.readonly
+    assert view.obj is cells.cells
+    assert bytes(view) == bytes(cells)
+
+
+def test_as_numpy_view():
+    np = pytest.importorskip("numpy")
+    cells = Grade2BrailleConverter().to_braille_cells("the cat")
+    array = cells.as_numpy()
+    assert array.dtype == np.uint8
+    assert array.tobytes() == bytes(cells)
+    assert not array.flags.writeable
+
+
+def test_append_requires_source_and_six_dot_braille():
+    cells = BrailleCells(track_offsets=True)
+    with pytest.raises(TypeError):
+        cells.append('⠁')
+    with pytest.raises(ValueError):
+        encode_cells('a')
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("groq")
+
+import bulk_generate
+from bulk_generate import PROMPT_SUFFIX, RateLimiter, load_checkpoint, parse_args, run
+from fake_server import make_server
+
+
+@pytest.fixture
+def server():
+    server = make_server(latency=0.01, rate_limit_every=7, retry_after=0.2, fail_every=11)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def run_job(server, prompt_file, output_file, *extra):
+    args = parse_args([str(prompt_file), str(output_file), "--base-url", server.url,
+                       "--concurrency", "4", "--requests-per-minute", "6000", *extra])
+    return asyncio.run(run(args))
+
+
+def records(output_file):
+    return [json.loads(line) for line in output_file.read_text(encoding="utf-8").splitlines()]
+
+
+def test_resume_after_crash_only_requests_missing_prompts(server, tmp_path, monkeypatch):
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    prompts = [f"The cat {i}" for i in range(20)]
+    prompt_file = tmp_path / "prompts.txt"
+    prompt_file.write_text("\n".join(prompts) + "\n", encoding="utf-8")
+    output_file = tmp_path / "out.jsonl"
+
+    stats = run_job(server, prompt_file, output_file)
+    assert stats == {"done": 20, "failed": 0}
+    # Every 7th request got a 429 and every 11th a 500, and all were retried
+    assert server.counter > 20
+    assert sorted(server.answered) == sorted(p + PROMPT_SUFFIX for p in prompts)
+
+    # Simulate a crash partway through writing the fourth record
+    lines = output_file.read_bytes().splitlines(keepends=True)
+    output_file.write_bytes(b"".join(lines[:3]) + lines[3][:40])
+    kept = {json.loads(line)["index"] for line in lines[:3]}
+
+    server.answered.clear()
+    stats = run_job(server, prompt_file, output_file)
+    assert stats == {"done": 17, "failed": 0}
+    missing = [p + PROMPT_SUFFIX for i, p in enumerate(prompts) if i not in kept]
+    assert sorted(server.answered) == sorted(missing)
+
+    result = records(output_file)
+    assert sorted(record["index"] for record in result) == list(range(20))
+    for record in result:
+        assert record["prompt"] == prompts[record["index"]]
+        assert record["braille_text"]
+
+    # A finished job makes no requests at all
+    server.answered.clear()
+    assert run_job(server, prompt_file, output_file) == {"done": 0, "failed": 0}
+    assert server.answered == []
+
+
+def test_edited_prompt_file_refuses_to_resume(tmp_path):
+    prompt_file = tmp_path / "prompts.txt"
+    prompt_file.write_text("The dog\n", encoding="utf-8")
+    output_file = tmp_path / "out.jsonl"
+    output_file.write_text(json.dumps({"index": 0, "prompt": "The cat"}) + "\n", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        asyncio.run(run(parse_args([str(prompt_file), str(output_file)])))
+
+
+def test_checkpoint_loader_truncates_partial_line(tmp_path):
+    output_file = tmp_path / "out.jsonl"
+    output_file.write_text('{"index": 0, "prompt": "a"}\n[1, 2]\n{"index": 1, "pro', encoding="utf-8")
+    assert load_checkpoint(output_file) == {0: "a"}
+    assert output_file.read_text(encoding="utf-8").endswith("[1, 2]\n")
+
+
+def test_missing_api_key_without_base_url_exits(tmp_path, monkeypatch):
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    prompt_file = tmp_path / "prompts.txt"
+    prompt_file.write_text("The cat\n", encoding="utf-8")
+    with pytest.raises(SystemExit, match="GROQ_API_KEY"):
+        asyncio.run(run(parse_args([str(prompt_file), str(tmp_path / "out.jsonl")])))
+
+
+def test_backoff_doubles_once_per_episode(monkeypatch):
+    monkeypatch.setattr(bulk_generate.random, "uniform", lambda a, b: 0)
+    limiter = RateLimiter(60, 1000)
+    for _ in range(8):
+        limiter.penalize()
+    assert limiter.backoff == 2.0
+    limiter.penalize(retry_after=5)
+    assert limiter.backoff == 2.0
+
+
+@pytest.mark.parametrize("flag", ["--concurrency", "--max-attempts"])
+def test_values_below_one_are_rejected(flag):
+    with pytest.raises(SystemExit):
+        parse_args(["prompts.txt", "out.jsonl", flag, "0"])
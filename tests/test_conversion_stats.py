@@ -0,0 +1,55 @@
+from ConversionStats import ConversionStats
+from Grade2BrailleConverter import Grade2BrailleConverter
+
+
+def convert(text, stats=None):
+    stats = stats if stats is not None else ConversionStats()
+    braille = Grade2BrailleConverter().to_braille(text, stats=stats)
+    return braille, stats
+
+
+def test_stats_do_not_change_output():
+    converter = Grade2BrailleConverter()
+    for text in ["The quick brown fox", "Price: $99.99 (50% off!)", "https://www.example.com", "{x}"]:
+        assert convert(text)[0] == converter.to_braille(text)
+
+
+def test_events_are_counted_separately():
+    _, stats = convert("The cat sat in the hall")
+    assert stats.events['letter'] == 10
+    assert stats.events['space'] == 5
+    assert stats.events['capital'] == 1
+    assert stats.cells == 19
+
+    _, stats = convert("Call 555-1234 {now}")
+    assert stats.events['digit'] == 7
+    assert stats.events['number_sign'] == 2
+    assert stats.events['punctuation'] == 1
+    assert stats.unmapped == {'{': 1, '}': 1}
+
+
+def test_scans_stop_at_the_matched_rule():
+    _, stats = convert("the")
+    table = list(Grade2BrailleConverter().whole_word_contractions)
+    position = table.index('the') + 1
+    assert stats.matches['whole_word'] == {'the': 1}
+    assert stats.positions['whole_word']['the'] == position
+    assert sum(stats.probes['whole_word'].values()) == position
+    assert stats.scans['letter_group'] == 0
+
+
+def test_empty_documents_are_counted():
+    stats = ConversionStats()
+    convert("", stats)
+    Grade2BrailleConverter().to_braille_cells("", stats=stats)
+    convert("the cat", stats)
+    assert stats.documents == 3
+    assert stats.characters == 7
+
+
+def test_report_ranks_rules_by_matches():
+    _, stats = convert("the cat sat in the hall")
+    report = stats.report()
+    assert "'the': 2 matches" in report
+    assert report.index("'the'") < report.index("'in'")
+    assert "spaces: 5, single-letter fallbacks: 10" in report